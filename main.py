@@ -1,36 +1,114 @@
 import yfinance as yf
 import pandas as pd
 import numpy as np
-from datetime import datetime
+from numpy.lib.stride_tricks import sliding_window_view
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from functools import lru_cache
+import glob
+import os
 import sys
+from typing import Final
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional; without it the indicator kernel runs as plain NumPy
+    def njit(*args, **kwargs):
+        return lambda fn: fn
 
 # --- CONSTANTS (v7.1 Spec) ---
-CONSTANTS = {
-    'TICKERS': ['XLG', 'RSP', 'HYG', 'IEF', 'JPY=X', '^GSPC'],
-    'PERIOD': '2y',
-    'DISTORTION_THRESHOLD': 0.15,      # Condition: XLG/RSP Gap > 15%
-    'CREDIT_LOOKBACK': 20,             # Trigger A: 20-day lookback
-    'YEN_SHOCK_THRESHOLD': -0.03,      # Trigger B: 5-day change < -3% (Yen Surge)
-    'RATE_SHOCK_THRESHOLD': -0.02,     # Trigger C: 10-day IEF change < -2%
-    'SPX_FILTER_THRESHOLD': 0.0        # Trigger C: SPX must be negative
-}
+TICKERS: Final[list] = ['XLG', 'RSP', 'HYG', 'IEF', 'JPY=X', '^GSPC']
+PERIOD: Final[str] = '2y'
+DISTORTION_THRESHOLD: Final[float] = 0.15     # Condition: XLG/RSP Gap > 15%
+CREDIT_LOOKBACK: Final[int] = 20              # Trigger A: 20-day lookback
+YEN_SHOCK_THRESHOLD: Final[float] = -0.03     # Trigger B: 5-day change < -3% (Yen Surge)
+RATE_SHOCK_THRESHOLD: Final[float] = -0.02    # Trigger C: 10-day IEF change < -2%
+SPX_FILTER_THRESHOLD: Final[float] = 0.0      # Trigger C: SPX must be negative
+
+# Field order matches the tuple returned by _compute
+Indicators = namedtuple('Indicators', [
+    'distortion_gap', 'credit_val', 'credit_ma20', 'credit_min20',
+    'spx_price', 'spx_ma50', 'spx_chg_10d', 'yen_chg_5d', 'ief_chg_10d',
+    'distortion_val', 'distortion_baseline'
+])
+
+CACHE_DIR = os.path.join('.cache', 'yf')
+
+def _cache_path(ticker, period, stamp=None):
+    # Keyed by date so a new trading day never reads yesterday's prices
+    stamp = stamp or datetime.now().strftime('%Y%m%d')
+    return os.path.join(CACHE_DIR, f"{ticker}_{period}_{stamp}.pkl")
+
+def load_cached_close(tickers, period):
+    paths = {t: _cache_path(t, period) for t in tickers}
+    if not all(os.path.exists(p) for p in paths.values()):
+        return None
+    return pd.concat({t: pd.read_pickle(p) for t, p in paths.items()}, axis=1)
+
+def store_cached_close(raw_data, period):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    for ticker in raw_data.columns:
+        if raw_data[ticker].isna().all():
+            # Failed download; leave the cache incomplete so the next run refetches
+            continue
+        path = _cache_path(ticker, period)
+        # Evict stale days for this ticker before writing today's snapshot
+        for old in glob.glob(_cache_path(glob.escape(ticker), period, stamp='*')):
+            if old != path:
+                os.remove(old)
+        raw_data[ticker].to_pickle(path)
+
+@lru_cache(maxsize=64)
+def _ticker(symbol):
+    # yfinance shares one HTTP session across Ticker objects, so reusing them keeps connections warm
+    return yf.Ticker(symbol)
+
+def _fetch_close(symbol, period):
+    # Only Close is used; skip the dividend/split columns and price-repair pass
+    close = _ticker(symbol).history(
+        period=period,
+        auto_adjust=True,
+        actions=False,
+        repair=False,
+        rounding=False,
+        keepna=False
+    )['Close']
+    # Each exchange reports in its own time zone; align all series on the trading date
+    close.index = close.index.tz_localize(None)
+    return close
+
+def download_close(tickers, period):
+    with ThreadPoolExecutor(max_workers=len(tickers)) as pool:
+        closes = pool.map(lambda t: _fetch_close(t, period), tickers)
+        return pd.concat(list(closes), axis=1, keys=tickers)
 
 def fetch_and_process_data():
-    print(f"[INFO] Fetching data for: {CONSTANTS['TICKERS']}")
-    
-    try:
-        raw_data = yf.download(
-            CONSTANTS['TICKERS'], 
-            period=CONSTANTS['PERIOD'], 
-            auto_adjust=True, 
-            progress=False,
-            threads=True
-        )['Close']
-    except Exception as e:
-        print(f"[ERROR] Failed to download data: {e}")
-        sys.exit(1)
+    raw_data = load_cached_close(TICKERS, PERIOD)
 
-    df = raw_data.dropna()
+    if raw_data is not None:
+        print(f"[INFO] Loaded cached data for: {TICKERS}")
+    else:
+        print(f"[INFO] Fetching data for: {TICKERS}")
+
+        try:
+            raw_data = download_close(TICKERS, PERIOD)
+        except Exception as e:
+            print(f"[ERROR] Failed to download data: {e}")
+            sys.exit(1)
+
+        try:
+            store_cached_close(raw_data, PERIOD)
+        except OSError as e:
+            print(f"[WARN] Failed to write cache: {e}")
+
+    # Complete data is the common case; only pay for the dropna copy when gaps exist
+    if raw_data.isna().to_numpy().any():
+        raw_data = raw_data.dropna()
+
+    # Prices carry well under 7 significant digits, so float32 halves the working set
+    df = raw_data.astype(np.float32)
     
     if df.empty:
         print("[ERROR] DataFrame is empty after dropna. Check tickers or period.")
@@ -39,66 +117,106 @@ def fetch_and_process_data():
     print(f"[INFO] Data synced. Latest Date: {df.index[-1].strftime('%Y-%m-%d')}")
     return df
 
-def calculate_indicators(df):
-    results = {}
-    
+@njit(cache=True)
+def _compute(a, xlg, rsp, hyg, ief, yen, spx, lookback):
+    # 200 days is the longest lookback; derive every stat from this one block
+    tail = a[-200:]
+    last, prev_5d, prev_10d = tail[-1], tail[-6], tail[-11]
+
     # --- A. Structure Distortion (XLG / RSP) ---
-    distortion_ratio = df['XLG'] / df['RSP']
-    baseline_200 = distortion_ratio.rolling(200).mean()
-    current_gap = (distortion_ratio / baseline_200) - 1
-    
-    results['distortion'] = {
-        'val': distortion_ratio.iloc[-1],
-        'baseline': baseline_200.iloc[-1],
-        'gap': current_gap.iloc[-1]
-    }
+    # Only the latest window matters, so reduce the tail instead of rolling the full series
+    distortion_ratio = tail[:, xlg] / tail[:, rsp]
+    distortion_val = distortion_ratio[-1]
+    distortion_baseline = distortion_ratio.mean()
 
     # --- B. Credit Crunch (HYG / IEF) ---
-    credit_ratio = df['HYG'] / df['IEF']
-    credit_ma20 = credit_ratio.rolling(CONSTANTS['CREDIT_LOOKBACK']).mean()
-    credit_min20 = credit_ratio.rolling(CONSTANTS['CREDIT_LOOKBACK']).min()
-    
-    results['credit'] = {
-        'val': credit_ratio.iloc[-1],
-        'ma20': credit_ma20.iloc[-1],
-        'min20': credit_min20.iloc[-1]
-    }
+    credit_tail = tail[-lookback:]
+    credit_ratio = credit_tail[:, hyg] / credit_tail[:, ief]
 
-    # --- C. Market Context (S&P 500) ---
-    spx_price = df['^GSPC']
-    spx_ma50 = spx_price.rolling(50).mean()
-    
-    results['spx'] = {
-        'price': spx_price.iloc[-1],
-        'ma50': spx_ma50.iloc[-1],
-        'change_10d': spx_price.pct_change(10).iloc[-1]
-    }
+    return (
+        distortion_val / distortion_baseline - 1,
+        credit_ratio[-1],
+        credit_ratio.mean(),
+        credit_ratio.min(),
+        # --- C. Market Context (S&P 500) ---
+        last[spx],
+        tail[-50:, spx].mean(),
+        last[spx] / prev_10d[spx] - 1,
+        # --- D. Risk Parameters (Yen & Rate) ---
+        last[yen] / prev_5d[yen] - 1,
+        last[ief] / prev_10d[ief] - 1,
+        distortion_val,
+        distortion_baseline,
+    )
+
+def calculate_indicators(df):
+    # Work on one ndarray with integer column indices to skip per-call Series overhead
+    cols = {t: i for i, t in enumerate(df.columns)}
+    return Indicators._make(float(v) for v in _compute(
+        np.ascontiguousarray(df.to_numpy(dtype=np.float32)),
+        cols['XLG'], cols['RSP'], cols['HYG'], cols['IEF'], cols['JPY=X'], cols['^GSPC'],
+        CREDIT_LOOKBACK
+    ))
+
+def _rolling(values, window, reduce):
+    # Reduce over a zero-copy window view; NaN-pad the head so row i lines up with df.index[i]
+    out = np.full(values.shape, np.nan, dtype=values.dtype)
+    if len(values) >= window:
+        out[window - 1:] = reduce(sliding_window_view(values, window), axis=-1)
+    return out
+
+def _change(values, n):
+    out = np.full(values.shape, np.nan, dtype=values.dtype)
+    out[n:] = values[n:] / values[:-n] - 1
+    return out
 
-    # --- D. Risk Parameters (Yen & Rate) ---
-    results['yen_change_5d'] = df['JPY=X'].pct_change(5).iloc[-1]
-    results['ief_change_10d'] = df['IEF'].pct_change(10).iloc[-1]
+def calculate_indicator_history(df):
+    # Same indicators as calculate_indicators, but as arrays over every row for backtesting
+    cols = {t: i for i, t in enumerate(df.columns)}
+    a = df.to_numpy()
+    xlg, rsp = a[:, cols['XLG']], a[:, cols['RSP']]
+    hyg, ief = a[:, cols['HYG']], a[:, cols['IEF']]
+    yen, spx = a[:, cols['JPY=X']], a[:, cols['^GSPC']]
 
-    return results
+    distortion_ratio = xlg / rsp
+    distortion_baseline = _rolling(distortion_ratio, 200, np.mean)
+    credit_ratio = hyg / ief
+    lookback = CREDIT_LOOKBACK
+
+    return Indicators(
+        distortion_gap=distortion_ratio / distortion_baseline - 1,
+        credit_val=credit_ratio,
+        credit_ma20=_rolling(credit_ratio, lookback, np.mean),
+        credit_min20=_rolling(credit_ratio, lookback, np.min),
+        spx_price=spx,
+        spx_ma50=_rolling(spx, 50, np.mean),
+        spx_chg_10d=_change(spx, 10),
+        yen_chg_5d=_change(yen, 5),
+        ief_chg_10d=_change(ief, 10),
+        distortion_val=distortion_ratio,
+        distortion_baseline=distortion_baseline
+    )
 
 def evaluate_logic(indicators):
     # 1. Condition: Distortion
-    is_distorted = indicators['distortion']['gap'] >= CONSTANTS['DISTORTION_THRESHOLD']
+    is_distorted = indicators.distortion_gap >= DISTORTION_THRESHOLD
     
     # 2. Trigger A: Credit Crunch
-    is_credit_low = indicators['credit']['val'] <= (indicators['credit']['min20'] * 1.0001)
-    is_credit_downtrend = indicators['credit']['val'] < indicators['credit']['ma20']
-    is_spx_high = indicators['spx']['price'] > indicators['spx']['ma50']
+    is_credit_low = indicators.credit_val <= (indicators.credit_min20 * 1.0001)
+    is_credit_downtrend = indicators.credit_val < indicators.credit_ma20
+    is_spx_high = indicators.spx_price > indicators.spx_ma50
     
-    trigger_a = is_credit_downtrend and is_credit_low and is_spx_high
+    # Bitwise & keeps this valid for both scalar and per-row (history) indicators
+    trigger_a = is_credit_downtrend & is_credit_low & is_spx_high
 
     # 3. Trigger B: Unwind Shock (Yen Surge)
-    trigger_b = indicators['yen_change_5d'] < CONSTANTS['YEN_SHOCK_THRESHOLD']
+    trigger_b = indicators.yen_chg_5d < YEN_SHOCK_THRESHOLD
 
     # 4. Trigger C: Bad Rate Spike
-    is_rate_crash = indicators['ief_change_10d'] < CONSTANTS['RATE_SHOCK_THRESHOLD']
-    is_stock_down = indicators['spx']['change_10d'] < CONSTANTS['SPX_FILTER_THRESHOLD']
+    is_rate_crash = indicators.ief_chg_10d < RATE_SHOCK_THRESHOLD
+    is_stock_down = indicators.spx_chg_10d < SPX_FILTER_THRESHOLD
     
-    trigger_c = is_rate_crash and is_stock_down
+    trigger_c = is_rate_crash & is_stock_down
 
     return {
         'condition': is_distorted,
@@ -107,115 +225,163 @@ def evaluate_logic(indicators):
         'trigger_c': trigger_c
     }
 
-def print_report(inds, logic):
+def evaluate_history(df):
+    # Boolean condition/trigger matrix for every date; the last row matches evaluate_logic
+    logic = evaluate_logic(calculate_indicator_history(df))
+    return pd.DataFrame(logic, index=df.index)
+
+REPORT_TEMPLATE = (
+    "\n" + "=" * 60 + "\n"
+    "📊 市場構造・危機検知レポート (v7.1)\n"
+    + "=" * 60 + "\n"
+    "\n1. Condition: Market Distortion (市場の歪み)\n"
+    "   結果: {gap} (閾値: {gap_threshold}) → [{condition}]"
+    "{condition_analysis}\n"
+    "\n2. Trigger A: Credit Crunch (信用の収縮)\n"
+    "   結果: Trend: {credit_trend}, 最安値更新: {credit_low} → [{trigger_a}]"
+    "{trigger_a_analysis}\n"
+    "\n3. Trigger B: Liquidity Shock (円キャリー)\n"
+    "   結果: {yen_chg} (閾値: {yen_threshold}) → [{trigger_b}]"
+    "{trigger_b_analysis}\n"
+    "\n4. Trigger C: Bad Rate Spike (悪い金利上昇)\n"
+    "   結果: 債券 {ief_chg}, 株価 {spx_chg} → [{trigger_c}]"
+    "{trigger_c_analysis}\n"
+    + "-" * 60 + "\n"
+    "\n" + "#" * 60 + "\n"
+    "   {level}\n"
+    + "#" * 60 + "\n"
+    "\n[総合判定メッセージ]\n{msg}\n\n"
+    + "#" * 60 + "\n\n"
+)
+
+# Judgment tiers as (level, message)
+LEVEL_CRITICAL = ("LEVEL 5: CRITICAL (崩壊)",
+                  "【システムの逆回転】信用収縮(A) または 流動性枯渇(B) が発生。\n即時撤退を推奨します。")
+LEVEL_WARNING = ("LEVEL 4: WARNING (警戒)",
+                 "【バリュエーション調整】悪い金利上昇(C) が発生。\nポジション縮小を推奨します。")
+LEVEL_OVERHEATED = ("LEVEL 3: OVERHEATED (過熱)",
+                    "【バブル温存】歪みは大ですがトリガーなし。\n静観・準備フェーズです。")
+LEVEL_NORMAL = ("LEVEL 1: NORMAL (正常)",
+                "【順行】システムは正常稼働中。\n投資継続で問題ありません。")
+
+# Indexed by trigger bitmask: A=8, B=4, C=2, condition=1 (A/B outrank C, which outranks condition)
+LEVELS = tuple(
+    LEVEL_CRITICAL if mask & 0b1100 else
+    LEVEL_WARNING if mask & 0b0010 else
+    LEVEL_OVERHEATED if mask & 0b0001 else
+    LEVEL_NORMAL
+    for mask in range(16)
+)
+
+def print_report(inds, logic, verbose=False):
     # Helper to format percentages
     def fmt_pct(val):
         return f"{val*100:+.2f}%"
 
-    print("\n" + "="*60)
-    print("📊 市場構造・危機検知レポート (v7.1)")
-    print("="*60)
-    
+    # Helper to prefix an analysis block with its header (omitted from the compact report)
+    def analysis(*lines):
+        if not verbose:
+            return ""
+        return "\n   [分析]:\n" + "\n".join(f"   {line}" for line in lines)
+
     # --- 1. Market Distortion ---
-    gap = inds['distortion']['gap']
-    gap_str = fmt_pct(gap)
-    threshold_str = fmt_pct(CONSTANTS['DISTORTION_THRESHOLD'])
-    
-    print(f"\n1. Condition: Market Distortion (市場の歪み)")
-    print(f"   結果: {gap_str} (閾値: {threshold_str}) → [{'TRUE' if logic['condition'] else 'FALSE'}]")
-    print("   [分析]:")
+    gap = inds.distortion_gap
     
     if logic['condition']:
-        print("   ⚠️ 危険水域です。トップ50社への資金集中が歴史的な水準(+15%超)に達しています。")
-        print("   崩壊時のエネルギー（燃料）が満タンの状態です。着火に注意してください。")
+        condition_analysis = analysis(
+            "⚠️ 危険水域です。トップ50社への資金集中が歴史的な水準(+15%超)に達しています。",
+            "崩壊時のエネルギー（燃料）が満タンの状態です。着火に注意してください。")
+    elif gap > 0:
+        condition_analysis = analysis(
+            "データ上は「正常範囲内」です。直近200日の平均的な歪み方と大きな差がありません。",
+            "歪んでいる状態が常態化（Baseline化）しており、新たな乖離加速は見られません。")
     else:
-        if gap > 0:
-            print(f"   データ上は「正常範囲内」です。直近200日の平均的な歪み方と大きな差がありません。")
-            print("   歪んでいる状態が常態化（Baseline化）しており、新たな乖離加速は見られません。")
-        else:
-            print("   歪みは解消されています。トップ50社とそれ以外が連動、あるいは循環物色されています。")
+        condition_analysis = analysis(
+            "歪みは解消されています。トップ50社とそれ以外が連動、あるいは循環物色されています。")
 
     # --- 2. Trigger A: Credit Crunch ---
-    cred_val = inds['credit']['val']
-    cred_ma = inds['credit']['ma20']
-    trend_str = "Bearish(下落)" if cred_val < cred_ma else "Bullish(上昇)"
-    
-    print(f"\n2. Trigger A: Credit Crunch (信用の収縮)")
-    print(f"   結果: Trend: {trend_str}, 最安値更新: {'YES' if logic['trigger_a'] else 'NO'} → [{'TRUE' if logic['trigger_a'] else 'FALSE'}]")
-    print("   [分析]:")
+    cred_val = inds.credit_val
+    cred_ma = inds.credit_ma20
     
     if logic['trigger_a']:
-        print("   ⛔ 危険信号点灯！株価は高いのに、債券市場で「ジャンク債」が捨てられています。")
-        print("   「質への逃避」が始まっています。典型的な暴落の先行指標です。")
+        trigger_a_analysis = analysis(
+            "⛔ 危険信号点灯！株価は高いのに、債券市場で「ジャンク債」が捨てられています。",
+            "「質への逃避」が始まっています。典型的な暴落の先行指標です。")
     elif cred_val >= cred_ma:
-        print("   ジャンク債が国債に対して強く、トレンドは上昇(Bullish)です。")
-        print("   これは「倒産リスクなんて誰も気にしていない（イケイケドンドン）」という状態です。")
-        print("   暴落の気配は微塵もありません。")
+        trigger_a_analysis = analysis(
+            "ジャンク債が国債に対して強く、トレンドは上昇(Bullish)です。",
+            "これは「倒産リスクなんて誰も気にしていない（イケイケドンドン）」という状態です。",
+            "暴落の気配は微塵もありません。")
     else:
-        print("   信用スプレッドはやや悪化していますが、決定的な安値更新には至っていません。")
-        print("   まだ「調整」の範囲内です。")
+        trigger_a_analysis = analysis(
+            "信用スプレッドはやや悪化していますが、決定的な安値更新には至っていません。",
+            "まだ「調整」の範囲内です。")
 
     # --- 3. Trigger B: Liquidity Shock ---
-    yen_chg = inds['yen_change_5d']
-    yen_str = fmt_pct(yen_chg)
-    thresh_yen = fmt_pct(CONSTANTS['YEN_SHOCK_THRESHOLD'])
-    
-    print(f"\n3. Trigger B: Liquidity Shock (円キャリー)")
-    print(f"   結果: {yen_str} (閾値: {thresh_yen}) → [{'TRUE' if logic['trigger_b'] else 'FALSE'}]")
-    print("   [分析]:")
+    yen_chg = inds.yen_chg_5d
     
     if logic['trigger_b']:
-        print("   ⛔ 危険信号点灯！急激な「円高」が進行しています。")
-        print("   円キャリー取引の巻き戻し（強制決済）による、世界的な換金売りリスクが高まっています。")
+        trigger_b_analysis = analysis(
+            "⛔ 危険信号点灯！急激な「円高」が進行しています。",
+            "円キャリー取引の巻き戻し（強制決済）による、世界的な換金売りリスクが高まっています。")
     elif yen_chg > 0:
-        print("   プラス値は「ドル高・円安」を意味します。")
-        print("   現在は真逆です。むしろ円安が進んでおり、キャリー取引による資金供給（燃料注入）が続いています。")
+        trigger_b_analysis = analysis(
+            "プラス値は「ドル高・円安」を意味します。",
+            "現在は真逆です。むしろ円安が進んでおり、キャリー取引による資金供給（燃料注入）が続いています。")
     else:
-        print("   円高方向への動きですが、パニック的な水準（-3%超）ではありません。")
-        print("   通常の変動範囲内です。")
+        trigger_b_analysis = analysis(
+            "円高方向への動きですが、パニック的な水準（-3%超）ではありません。",
+            "通常の変動範囲内です。")
 
     # --- 4. Trigger C: Bad Rate Spike ---
-    ief_chg = inds['ief_change_10d']
-    spx_chg = inds['spx']['change_10d']
-    
-    print(f"\n4. Trigger C: Bad Rate Spike (悪い金利上昇)")
-    print(f"   結果: 債券 {fmt_pct(ief_chg)}, 株価 {fmt_pct(spx_chg)} → [{'TRUE' if logic['trigger_c'] else 'FALSE'}]")
-    print("   [分析]:")
+    ief_chg = inds.ief_chg_10d
     
     if logic['trigger_c']:
-        print("   ⚠️ 警告！「悪い金利上昇」です。")
-        print("   金利急騰（債券急落）に対し、株価が耐えきれず下落しています。バリュエーション調整の合図です。")
-    elif ief_chg < CONSTANTS['RATE_SHOCK_THRESHOLD']:
-        print("   金利は急騰（債券急落）していますが、株価は上昇しています。")
-        print("   これは典型的な『良い金利上昇（業績相場・トランプトレード）』です。")
-        print("   フィルターが機能し、正常と判定しました。")
+        trigger_c_analysis = analysis(
+            "⚠️ 警告！「悪い金利上昇」です。",
+            "金利急騰（債券急落）に対し、株価が耐えきれず下落しています。バリュエーション調整の合図です。")
+    elif ief_chg < RATE_SHOCK_THRESHOLD:
+        trigger_c_analysis = analysis(
+            "金利は急騰（債券急落）していますが、株価は上昇しています。",
+            "これは典型的な『良い金利上昇（業績相場・トランプトレード）』です。",
+            "フィルターが機能し、正常と判定しました。")
     else:
-        print("   金利のパニック的な急騰は見られません。落ち着いています。")
+        trigger_c_analysis = analysis(
+            "金利のパニック的な急騰は見られません。落ち着いています。")
 
-    print("-" * 60)
-    
     # --- FINAL JUDGMENT ---
-    if logic['trigger_a'] or logic['trigger_b']:
-        level = "LEVEL 5: CRITICAL (崩壊)"
-        msg = "【システムの逆回転】信用収縮(A) または 流動性枯渇(B) が発生。\n即時撤退を推奨します。"
-    elif logic['trigger_c']:
-        level = "LEVEL 4: WARNING (警戒)"
-        msg = "【バリュエーション調整】悪い金利上昇(C) が発生。\nポジション縮小を推奨します。"
-    elif logic['condition']:
-        level = "LEVEL 3: OVERHEATED (過熱)"
-        msg = "【バブル温存】歪みは大ですがトリガーなし。\n静観・準備フェーズです。"
-    else:
-        level = "LEVEL 1: NORMAL (正常)"
-        msg = "【順行】システムは正常稼働中。\n投資継続で問題ありません。"
+    mask = (logic['trigger_a'] << 3) | (logic['trigger_b'] << 2) | (logic['trigger_c'] << 1) | logic['condition']
+    level, msg = LEVELS[mask]
 
-    print(f"\n{'#'*60}")
-    print(f"   {level}")
-    print(f"{'#'*60}")
-    print(f"\n[総合判定メッセージ]\n{msg}\n")
-    print(f"{'#'*60}\n")
+    # Fill one template and emit it with a single write instead of a print per line
+    sys.stdout.write(REPORT_TEMPLATE.format_map({
+        'gap': fmt_pct(gap),
+        'gap_threshold': fmt_pct(DISTORTION_THRESHOLD),
+        'condition': 'TRUE' if logic['condition'] else 'FALSE',
+        'condition_analysis': condition_analysis,
+        'credit_trend': "Bearish(下落)" if cred_val < cred_ma else "Bullish(上昇)",
+        'credit_low': 'YES' if logic['trigger_a'] else 'NO',
+        'trigger_a': 'TRUE' if logic['trigger_a'] else 'FALSE',
+        'trigger_a_analysis': trigger_a_analysis,
+        'yen_chg': fmt_pct(yen_chg),
+        'yen_threshold': fmt_pct(YEN_SHOCK_THRESHOLD),
+        'trigger_b': 'TRUE' if logic['trigger_b'] else 'FALSE',
+        'trigger_b_analysis': trigger_b_analysis,
+        'ief_chg': fmt_pct(ief_chg),
+        'spx_chg': fmt_pct(inds.spx_chg_10d),
+        'trigger_c': 'TRUE' if logic['trigger_c'] else 'FALSE',
+        'trigger_c_analysis': trigger_c_analysis,
+        'level': level,
+        'msg': msg
+    }))
 
-if __name__ == "__main__":
+@lru_cache(maxsize=1)
+def todays_signal(date_key):
+    # The pipeline is deterministic per day; key on the date so repeat callers skip the refetch
     df = fetch_and_process_data()
     indicators = calculate_indicators(df)
-    logic = evaluate_logic(indicators)
-    print_report(indicators, logic)
+    return indicators, evaluate_logic(indicators)
+
+if __name__ == "__main__":
+    indicators, logic = todays_signal(date.today())
+    print_report(indicators, logic, verbose=True)